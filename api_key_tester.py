@@ -1,6 +1,31 @@
 import os
-import requests
-import json
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+
+from elevenlabs_tts import REQUEST_CONFIG, create_session
+
+# Keep-alive session shared by all diagnostic requests
+session = create_session()
+
+def _check_user(api_key: str):
+    """Fetch /v1/user and return (status_code, parsed JSON or error text)"""
+    url = "https://api.elevenlabs.io/v1/user"
+    headers = {"xi-api-key": api_key}
+    
+    response = session.get(url, headers=headers, timeout=REQUEST_CONFIG["timeout"])
+    if response.status_code == 200:
+        return response.status_code, orjson.loads(response.content)
+    return response.status_code, response.text
+
+def _check_voices(api_key: str):
+    """Fetch /v1/voices and return (status_code, parsed JSON or error text)"""
+    url = "https://api.elevenlabs.io/v1/voices"
+    headers = {"xi-api-key": api_key}
+    
+    response = session.get(url, headers=headers, timeout=REQUEST_CONFIG["timeout"])
+    if response.status_code == 200:
+        return response.status_code, orjson.loads(response.content)
+    return response.status_code, response.text
 
 def test_elevenlabs_api():
     """Test ElevenLabs API connection and authentication"""
@@ -18,23 +43,24 @@ def test_elevenlabs_api():
     
     print(f"🔑 Using API key: {api_key[:8]}...{api_key[-4:] if len(api_key) > 12 else '***'}")
     
+    # Both checks are independent, so run them concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        user_future = executor.submit(_check_user, api_key)
+        voices_future = executor.submit(_check_voices, api_key)
+    
     # Test 1: Check API key validity with user info
     print("\n📋 Test 1: Checking API key validity...")
     try:
-        url = "https://api.elevenlabs.io/v1/user"
-        headers = {"xi-api-key": api_key}
+        status_code, user_info = user_future.result()
+        print(f"Status Code: {status_code}")
         
-        response = requests.get(url, headers=headers)
-        print(f"Status Code: {response.status_code}")
-        
-        if response.status_code == 200:
-            user_info = response.json()
+        if status_code == 200:
             print(f"✅ API key is valid!")
             print(f"User ID: {user_info.get('user_id', 'N/A')}")
             print(f"Characters remaining: {user_info.get('subscription', {}).get('character_count', 'N/A')}")
             print(f"Character limit: {user_info.get('subscription', {}).get('character_limit', 'N/A')}")
         else:
-            print(f"❌ API key validation failed: {response.text}")
+            print(f"❌ API key validation failed: {user_info}")
             return False
             
     except Exception as e:
@@ -44,14 +70,10 @@ def test_elevenlabs_api():
     # Test 2: Get available voices
     print("\n🎤 Test 2: Getting available voices...")
     try:
-        url = "https://api.elevenlabs.io/v1/voices"
-        headers = {"xi-api-key": api_key}
+        status_code, voices_data = voices_future.result()
+        print(f"Status Code: {status_code}")
         
-        response = requests.get(url, headers=headers)
-        print(f"Status Code: {response.status_code}")
-        
-        if response.status_code == 200:
-            voices_data = response.json()
+        if status_code == 200:
             voices = voices_data.get("voices", [])
             print(f"✅ Found {len(voices)} voices")
             
@@ -66,7 +88,7 @@ def test_elevenlabs_api():
             
             return voices
         else:
-            print(f"❌ Failed to get voices: {response.text}")
+            print(f"❌ Failed to get voices: {voices_data}")
             return False
             
     except Exception as e:
@@ -95,7 +117,8 @@ def test_tts_with_voice(api_key: str, voice_id: str):
             }
         }
         
-        response = requests.post(url, json=data, headers=headers)
+        response = session.post(url, data=orjson.dumps(data), headers=headers,
+                                timeout=REQUEST_CONFIG["timeout"])
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -130,5 +153,7 @@ if __name__ == "__main__":
         test_voice_id = voices[0]['voice_id']
         test_tts_with_voice(api_key, test_voice_id)
     
+    session.close()
+    
     print(f"\n{'='*40}")
     print("Diagnostic complete!")
\ No newline at end of file
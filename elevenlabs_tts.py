@@ -1,18 +1,148 @@
 import os
 import json
+import asyncio
+import hashlib
+import shutil
+import subprocess
+import queue
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+import threading
+from functools import cached_property
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import re
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
+
+try:
+    import aiohttp
+except ImportError:  # Only needed for the async pipeline
+    aiohttp = None
+
+# HTTP behaviour shared by all ElevenLabs requests
+REQUEST_CONFIG = {
+    "timeout": (5, 30),       # (connect, read) seconds
+    "retries": 3,
+    "backoff_factor": 0.5,
+    "pool_size": 8,
+}
+
+# Rate limits and transient server errors are retried with backoff
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def create_session(request_config: Dict = REQUEST_CONFIG) -> requests.Session:
+    """Create a keep-alive session that retries rate limits and transient 5xx errors"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=request_config["pool_size"],
+        pool_maxsize=request_config["pool_size"],
+        max_retries=Retry(total=request_config["retries"],
+                          backoff_factor=request_config["backoff_factor"],
+                          status_forcelist=RETRY_STATUSES,
+                          allowed_methods=("GET", "POST"),
+                          # Hand the final response back so callers can report its status and body
+                          raise_on_status=False)
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+# Directories this process has already created, so per-file writes skip the mkdir syscall
+_created_dirs = set()
+
+
+def _ensure_dir(path) -> None:
+    """Create path (and parents) once per process; '' means the current directory"""
+    path = os.fspath(path)
+    if path and path not in _created_dirs:
+        os.makedirs(path, exist_ok=True)
+        _created_dirs.add(path)
+
+
+# Audio is written straight to a raw fd, so read it in large chunks to keep syscalls few
+WRITE_CHUNK_SIZE = 64 * 1024
+
+
+def _open_audio_file(path: str) -> int:
+    """Open path for writing without Python-level buffering"""
+    return os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """os.write until all of data is written (it may write partially)"""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _discard_file(path: str) -> None:
+    """Remove path, ignoring it if it was never created"""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _output_exists(path: str) -> bool:
+    """True if path is a non-empty file from a previous run"""
+    try:
+        return os.stat(path).st_size > 0
+    except FileNotFoundError:
+        return False
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting how fast requests are started
+    
+    Up to `burst` requests may start at once; after that, tokens refill
+    at `requests_per_second`. Callers wait for a token up front instead
+    of hitting 429s and backing off.
+    """
+    
+    def __init__(self, requests_per_second: float, burst: int = 1):
+        self.rate = requests_per_second
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Take a token (possibly going into debt) and return how long to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+    
+    def wait(self) -> None:
+        """Block until the next request slot is available"""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def wait_async(self) -> None:
+        """Sleep (without blocking the event loop) until the next slot"""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
 
 class ElevenLabsSwedishTTS:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, request_config: Optional[Dict] = None):
         """
         Initialize the ElevenLabs TTS client
         
         Args:
             api_key: Your ElevenLabs API key
+            request_config: Overrides for REQUEST_CONFIG (timeout, retries, ...)
         """
         self.api_key = api_key
         self.base_url = "https://api.elevenlabs.io/v1"
@@ -22,6 +152,13 @@ class ElevenLabsSwedishTTS:
             "xi-api-key": api_key
         }
         
+        self.request_config = {**REQUEST_CONFIG, **(request_config or {})}
+        self.timeout = self.request_config["timeout"]
+        
+        # One pooled keep-alive session so repeated calls reuse the TLS connection
+        self.session = create_session(self.request_config)
+        self.session.headers.update(self.headers)
+        
         # Swedish voice IDs (you may need to update these based on available voices)
         # These are example voice IDs - check your ElevenLabs dashboard for actual Swedish voices
         self.swedish_voices = {
@@ -31,17 +168,77 @@ class ElevenLabsSwedishTTS:
         }
         
         self.default_voice = "female_1"
+        
+        # Synthesis settings shared by every request
+        self.model_id = "eleven_multilingual_v2"  # Best model for non-English languages
+        self.voice_settings = {
+            "stability": 0.5,
+            "similarity_boost": 0.75,
+            "style": 0.0,
+            "use_speaker_boost": True
+        }
+        self._voice_urls: Dict[str, str] = {}
+        
+        # Streaming endpoint tuning (latency mode 0-4, higher starts audio sooner)
+        self.optimize_streaming_latency = 3
+        self.output_format = "mp3_44100_64"
+        
+        # Local cache of generated audio, keyed by request content
+        self.cache_dir = Path(".tts_cache")
+        self.cache_max_files = 500
+        
+        # Voice list cache, one file per API key since rosters differ per account
+        key_digest = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+        self._voices_cache_path = self.cache_dir / f"voices_{key_digest}.json"
+        self.voices_cache_ttl = 24 * 60 * 60
+        
+        # Locally tracked character quota, refreshed from /v1/user periodically
+        self.chars_remaining: Optional[int] = None
+        self.quota_refresh_interval = 5 * 60
+        self._quota_checked_at = float("-inf")
+        self._quota_lock = threading.Lock()
+        # Characters reserved by requests that have not finished yet
+        self._chars_in_flight = 0
+        # Held while fetching /v1/user so concurrent workers refresh only once
+        self._quota_refresh_lock = threading.Lock()
+    
+    def close(self) -> None:
+        """Close the underlying HTTP session"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    @cached_property
+    def voices(self) -> List[Dict]:
+        """Swedish/multilingual voices, fetched at most once per instance"""
+        return self.get_available_voices()
     
     def get_available_voices(self) -> List[Dict]:
-        """Get list of available voices from ElevenLabs"""
+        """Get list of available voices from ElevenLabs
+        
+        Results are cached on disk for voices_cache_ttl seconds.
+        """
+        try:
+            if (self._voices_cache_path.exists() and
+                    time.time() - self._voices_cache_path.stat().st_mtime < self.voices_cache_ttl):
+                return orjson.loads(self._voices_cache_path.read_bytes())
+        except (OSError, ValueError) as e:
+            print(f"⚠ Ignoring unreadable voice cache: {e}")
+        
         try:
             url = f"{self.base_url}/voices"
-            headers = {"xi-api-key": self.api_key}
+            headers = {"Accept": "application/json"}
+            # Let the server drop legacy voices instead of downloading and filtering them here
+            params = {"show_legacy": "false"}
             
-            response = requests.get(url, headers=headers)
+            response = self.session.get(url, headers=headers, params=params, timeout=self.timeout)
             response.raise_for_status()
             
-            voices_data = response.json()
+            voices_data = orjson.loads(response.content)
             swedish_voices = []
             
             # Filter for Swedish voices or voices that work well with Swedish
@@ -56,16 +253,207 @@ class ElevenLabsSwedishTTS:
                         "labels": voice.get("labels", {})
                     })
             
+            # A failed cache write must not discard the voices we just fetched
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                self._voices_cache_path.write_bytes(orjson.dumps(swedish_voices))
+            except OSError as e:
+                print(f"⚠ Could not cache voice list: {e}")
+            
             return swedish_voices
             
         except Exception as e:
             print(f"Error fetching voices: {e}")
             return []
     
+    def refresh_quota(self) -> Optional[int]:
+        """
+        Fetch the remaining character quota from /v1/user
+        
+        Returns:
+            Remaining characters after subtracting in-flight requests, or
+            None if the quota could not be read (in which case requests are
+            not checked locally)
+        """
+        try:
+            response = self.session.get(f"{self.base_url}/user",
+                                        headers={"Accept": "application/json"},
+                                        timeout=self.timeout)
+            response.raise_for_status()
+            subscription = orjson.loads(response.content).get("subscription", {})
+            remaining = subscription["character_limit"] - subscription["character_count"]
+        except Exception as e:
+            print(f"⚠ Could not read character quota: {e}")
+            remaining = None
+        
+        with self._quota_lock:
+            # The server doesn't count requests still in flight yet
+            if remaining is not None:
+                remaining -= self._chars_in_flight
+            self.chars_remaining = remaining
+            self._quota_checked_at = time.monotonic()
+        return remaining
+    
+    def _quota_is_stale(self) -> bool:
+        return time.monotonic() - self._quota_checked_at > self.quota_refresh_interval
+    
+    def _reserve_characters(self, count: int) -> bool:
+        """Deduct count characters from the cached quota if enough are left"""
+        if self._quota_is_stale():
+            with self._quota_refresh_lock:
+                # Another worker may have refreshed while we waited for the lock
+                if self._quota_is_stale():
+                    self.refresh_quota()
+        
+        with self._quota_lock:
+            if self.chars_remaining is not None:
+                if count > self.chars_remaining:
+                    return False
+                self.chars_remaining -= count
+            self._chars_in_flight += count
+            return True
+    
+    def _commit_characters(self, count: int) -> None:
+        """Mark characters reserved for a successful request as spent"""
+        with self._quota_lock:
+            self._chars_in_flight -= count
+    
+    def _release_characters(self, count: int) -> None:
+        """Give back characters reserved for a request that failed"""
+        if not count:
+            return
+        with self._quota_lock:
+            self._chars_in_flight -= count
+            if self.chars_remaining is not None:
+                self.chars_remaining += count
+    
+    def _speech_request(self, text: str, voice_id: str = None) -> Tuple[str, Dict, Dict]:
+        """Build the (url, query params, JSON body) for a streaming synthesis request"""
+        if voice_id is None:
+            voice_id = self.swedish_voices[self.default_voice]
+        
+        url = self._voice_urls.get(voice_id)
+        if url is None:
+            url = self._voice_urls.setdefault(
+                voice_id, f"{self.base_url}/text-to-speech/{voice_id}/stream"
+            )
+        params = {
+            "optimize_streaming_latency": self.optimize_streaming_latency,
+            "output_format": self.output_format
+        }
+        
+        data = {
+            "text": text,
+            "model_id": self.model_id,
+            "voice_settings": self.voice_settings
+        }
+        
+        return url, params, data
+    
+    def _request_speech(self, url: str, params: Dict, data: Dict) -> requests.Response:
+        """Start a streaming synthesis request and return the open response"""
+        # Content-Type: application/json is already set on the session
+        response = self.session.post(url, params=params, data=orjson.dumps(data),
+                                     stream=True, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+    
+    def _cache_path(self, url: str, params: Dict, data: Dict) -> Path:
+        """Content-addressed cache location for a synthesis request"""
+        key = hashlib.sha256(
+            f"{url}|{json.dumps(params, sort_keys=True)}|{json.dumps(data, sort_keys=True)}".encode("utf-8")
+        ).hexdigest()
+        return self.cache_dir / f"{key}.mp3"
+    
+    def _restore_from_cache(self, cache_path: Path, output_file: str) -> bool:
+        """Link or copy a cached MP3 to output_file; returns False on a cache miss"""
+        if not cache_path.exists():
+            return False
+        
+        part_file = self._prepare_part_file(output_file)
+        try:
+            try:
+                os.link(cache_path, part_file)
+            except OSError:
+                shutil.copyfile(cache_path, part_file)
+            os.replace(part_file, output_file)
+        except BaseException:
+            _discard_file(part_file)
+            raise
+        
+        # Mark the entry as recently used for LRU eviction
+        os.utime(cache_path)
+        print(f"✓ Audio restored from cache: {output_file}")
+        return True
+    
+    def _store_in_cache(self, output_file: str, cache_path: Path) -> None:
+        """Add a freshly generated MP3 to the cache and evict old entries"""
+        try:
+            _ensure_dir(self.cache_dir)
+            tmp_path = cache_path.with_suffix(f".{threading.get_ident()}.tmp")
+            try:
+                os.link(output_file, tmp_path)
+            except OSError:
+                shutil.copyfile(output_file, tmp_path)
+            os.replace(tmp_path, cache_path)
+            self._evict_cache()
+        except OSError as e:
+            print(f"⚠ Could not cache {output_file}: {e}")
+    
+    def _evict_cache(self) -> None:
+        """Delete the least recently used entries beyond cache_max_files"""
+        entries = list(self.cache_dir.glob("*.mp3"))
+        if len(entries) <= self.cache_max_files:
+            return
+        
+        def last_used(path: Path) -> float:
+            try:
+                return path.stat().st_atime
+            except FileNotFoundError:
+                return 0.0
+        
+        entries.sort(key=last_used)
+        for path in entries[:len(entries) - self.cache_max_files]:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+    
+    def _prepare_part_file(self, output_file: str) -> str:
+        """
+        Create the output directory and return a fresh <output_file>.part path
+        
+        Output is written to the .part file and os.replace()d over
+        output_file, so a previous output survives a failed write and a
+        cache entry hard-linked to it is never truncated. A stale .part file
+        left by an interrupted run is unlinked first for the same reason.
+        """
+        _ensure_dir(os.path.dirname(output_file))
+        part_file = output_file + ".part"
+        _discard_file(part_file)
+        return part_file
+    
+    def stream_text_to_speech(self, text: str, voice_id: str = None) -> Iterator[bytes]:
+        """
+        Yield audio chunks as soon as ElevenLabs produces them
+        
+        Args:
+            text: Text to convert to speech
+            voice_id: Voice ID to use (uses default if None)
+            
+        Yields:
+            bytes: MP3 audio chunks, e.g. for piping to a player
+        """
+        with self._request_speech(*self._speech_request(text, voice_id)) as response:
+            yield from response.iter_content(chunk_size=4096)
+    
     def text_to_speech(self, text: str, voice_id: str = None, output_file: str = None) -> bool:
         """
         Convert text to speech using ElevenLabs API
         
+        Identical requests are served from the local cache without
+        calling the API.
+        
         Args:
             text: Text to convert to speech
             voice_id: Voice ID to use (uses default if None)
@@ -74,33 +462,41 @@ class ElevenLabsSwedishTTS:
         Returns:
             bool: Success status
         """
+        reserved = 0
         try:
-            if voice_id is None:
-                voice_id = self.swedish_voices[self.default_voice]
-            
-            url = f"{self.base_url}/text-to-speech/{voice_id}"
+            url, params, data = self._speech_request(text, voice_id)
+            cache_path = self._cache_path(url, params, data)
             
-            data = {
-                "text": text,
-                "model_id": "eleven_multilingual_v2",  # Best model for non-English languages
-                "voice_settings": {
-                    "stability": 0.5,
-                    "similarity_boost": 0.75,
-                    "style": 0.0,
-                    "use_speaker_boost": True
-                }
-            }
+            if output_file and self._restore_from_cache(cache_path, output_file):
+                return True
             
-            response = requests.post(url, json=data, headers=self.headers)
-            response.raise_for_status()
+            # Reject locally instead of paying a round trip for a quota error
+            if not self._reserve_characters(len(text)):
+                print(f"✗ Not enough character quota left for {len(text)} characters "
+                      f"({self.chars_remaining} remaining)")
+                return False
+            reserved = len(text)
             
-            # Save audio file
-            if output_file:
-                os.makedirs(os.path.dirname(output_file), exist_ok=True)
-                with open(output_file, 'wb') as f:
-                    f.write(response.content)
-                print(f"✓ Audio saved: {output_file}")
-                return True
+            with self._request_speech(url, params, data) as response:
+                # Save audio file as chunks arrive; the .part file only becomes
+                # output_file once the whole stream has been written
+                if output_file:
+                    part_file = self._prepare_part_file(output_file)
+                    try:
+                        fd = _open_audio_file(part_file)
+                        try:
+                            for chunk in response.iter_content(chunk_size=WRITE_CHUNK_SIZE):
+                                _write_all(fd, chunk)
+                        finally:
+                            os.close(fd)
+                        os.replace(part_file, output_file)
+                    except BaseException:
+                        _discard_file(part_file)
+                        raise
+                    self._store_in_cache(output_file, cache_path)
+                    self._commit_characters(reserved)
+                    print(f"✓ Audio saved: {output_file}")
+                    return True
                 
         except requests.exceptions.RequestException as e:
             print(f"✗ API request failed: {e}")
@@ -110,23 +506,112 @@ class ElevenLabsSwedishTTS:
         except Exception as e:
             print(f"✗ Error generating TTS: {e}")
             
+        self._release_characters(reserved)
         return False
     
-    def process_news_articles(self, articles_folder: str = "articles_for_tts", 
-                            output_folder: str = "audio_news", 
-                            voice_id: str = None,
-                            max_length: int = 5000) -> None:
+    async def _request_speech_async(self, client: "aiohttp.ClientSession", url: str,
+                                    params: Dict, data: Dict) -> "aiohttp.ClientResponse":
         """
-        Process all news articles from the scraper and generate TTS
+        Send a synthesis request, retrying RETRY_STATUSES responses like the requests session does
+        
+        Waits for Retry-After when the server sends it, otherwise backs off
+        exponentially. The last response is returned whatever its status.
+        """
+        retries = self.request_config["retries"]
+        backoff_factor = self.request_config["backoff_factor"]
+        body = orjson.dumps(data)
+        
+        for attempt in range(retries + 1):
+            response = await client.post(url, params=params, data=body,
+                                         headers={"Content-Type": "application/json"})
+            if response.status not in RETRY_STATUSES or attempt == retries:
+                return response
+            
+            try:
+                delay = float(response.headers.get("Retry-After", ""))
+            except ValueError:
+                delay = backoff_factor * (2 ** attempt)
+            response.release()
+            
+            print(f"⚠ API returned {response.status}, retrying in {delay:.1f}s "
+                  f"({attempt + 1}/{retries})")
+            await asyncio.sleep(delay)
+    
+    async def text_to_speech_async(self, client: "aiohttp.ClientSession", text: str,
+                                   voice_id: str = None, output_file: str = None) -> bool:
+        """
+        Async variant of text_to_speech
         
         Args:
-            articles_folder: Folder containing text articles
-            output_folder: Folder to save audio files
-            voice_id: Voice ID to use
-            max_length: Maximum text length per audio file (to avoid API limits)
+            client: Open aiohttp session to send the request with
+            text: Text to convert to speech
+            voice_id: Voice ID to use (uses default if None)
+            output_file: Output file path
+            
+        Returns:
+            bool: Success status
+        """
+        reserved = 0
+        try:
+            url, params, data = self._speech_request(text, voice_id)
+            cache_path = self._cache_path(url, params, data)
+            
+            if output_file and self._restore_from_cache(cache_path, output_file):
+                return True
+            
+            # Quota refreshes are blocking HTTP calls, keep them off the event loop
+            loop = asyncio.get_running_loop()
+            if not await loop.run_in_executor(None, self._reserve_characters, len(text)):
+                print(f"✗ Not enough character quota left for {len(text)} characters "
+                      f"({self.chars_remaining} remaining)")
+                return False
+            reserved = len(text)
+            
+            async with await self._request_speech_async(client, url, params, data) as response:
+                if response.status >= 400:
+                    print(f"✗ API request failed: {response.status} {response.reason}")
+                    print(f"Response status: {response.status}")
+                    print(f"Response text: {await response.text()}")
+                    self._release_characters(reserved)
+                    return False
+                
+                # Save audio file as chunks arrive; the .part file only becomes
+                # output_file once the whole stream has been written
+                if output_file:
+                    part_file = self._prepare_part_file(output_file)
+                    try:
+                        fd = _open_audio_file(part_file)
+                        try:
+                            async for chunk in response.content.iter_chunked(WRITE_CHUNK_SIZE):
+                                _write_all(fd, chunk)
+                        finally:
+                            os.close(fd)
+                        os.replace(part_file, output_file)
+                    except BaseException:
+                        _discard_file(part_file)
+                        raise
+                    self._store_in_cache(output_file, cache_path)
+                    self._commit_characters(reserved)
+                    print(f"✓ Audio saved: {output_file}")
+                    return True
+                
+        except aiohttp.ClientError as e:
+            print(f"✗ API request failed: {e}")
+        except Exception as e:
+            print(f"✗ Error generating TTS: {e}")
+            
+        self._release_characters(reserved)
+        return False
+    
+    def _list_articles(self, articles_folder: str, output_folder: str) -> Optional[List[os.DirEntry]]:
         """
+        List article text files, largest first
         
-        # Create output directory
+        Returns:
+            Directory entries, or None if there is nothing to process
+        """
+        
+        # Create output directory; checked on every run in case it was removed
         os.makedirs(output_folder, exist_ok=True)
         
         # Get all text files from articles folder
@@ -134,73 +619,342 @@ class ElevenLabsSwedishTTS:
         if not articles_path.exists():
             print(f"Articles folder '{articles_folder}' not found!")
             print("Please run the news scraper first.")
-            return
+            return None
         
-        text_files = list(articles_path.glob("*.txt"))
+        with os.scandir(articles_path) as it:
+            entries = [entry for entry in it
+                       if entry.name.endswith(".txt") and not entry.name.startswith(".")
+                       and entry.is_file()]
         
-        if not text_files:
+        if not entries:
             print(f"No text files found in '{articles_folder}'")
-            return
+            return None
         
-        print(f"Found {len(text_files)} articles to process")
+        # Longest articles first so they don't finish last under parallel execution
+        entries.sort(key=lambda entry: entry.stat().st_size, reverse=True)
         
-        successful = 0
-        failed = 0
+        print(f"Found {len(entries)} articles to process")
+        return entries
+    
+    def _read_article_jobs(self, entry: os.DirEntry, output_folder: str,
+                           max_length: int) -> Optional[Tuple[List[Tuple[str, str]], Optional[str]]]:
+        """
+        Read one article and split it into (text, audio_path) jobs
         
-        for i, text_file in enumerate(text_files, 1):
+        Returns:
+            Tuple of (jobs, article audio path if the article was split into
+            parts or has already been generated, else None), or None if the
+            file is empty or unreadable. Already generated articles have no
+            jobs.
+        """
+        text_file = Path(entry.path)
+        article_path = os.path.join(output_folder, f"{text_file.stem}.mp3")
+        
+        # Reruns skip articles whose (possibly merged) audio already exists
+        if _output_exists(article_path):
+            print(f"✓ Already generated: {article_path}")
+            return [], article_path
+        
+        try:
+            # Skip zero-byte files without opening them
+            if entry.stat().st_size == 0:
+                print(f"✗ Empty file: {text_file.name}")
+                return None
+            
+            # Read article content
+            content = text_file.read_text(encoding='utf-8').strip()
+            
+            if not content:
+                print(f"✗ Empty file: {text_file.name}")
+                return None
+            
+            # Split content if it's too long
+            if len(content) > max_length:
+                print(f"⚠ {text_file.name} too long ({len(content)} chars), splitting...")
+                parts = self.split_text(content, max_length)
+                
+                jobs = []
+                for part_idx, part in enumerate(parts):
+                    audio_filename = f"{text_file.stem}_part{part_idx + 1:02d}.mp3"
+                    jobs.append((part, os.path.join(output_folder, audio_filename)))
+                
+                return jobs, article_path
+            
+            return [(content, article_path)], None
+            
+        except Exception as e:
+            print(f"✗ Error processing {text_file.name}: {e}")
+            return None
+    
+    def _merge_article_parts(self, split_articles: Dict[str, List[str]],
+                             generated: set) -> None:
+        """
+        Concatenate the part files of each split article into one MP3
+        
+        Uses ffmpeg's concat demuxer with stream copy (no re-encoding).
+        Articles with a missing part are left as separate files.
+        
+        Args:
+            split_articles: Article audio path -> ordered part paths
+            generated: Audio paths that were generated successfully
+        """
+        if not split_articles:
+            return
+        
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            print("⚠ ffmpeg not found, keeping split articles as separate part files")
+            return
+        
+        for article_path, part_paths in split_articles.items():
+            if not all(path in generated for path in part_paths):
+                print(f"⚠ Not merging {article_path}: some parts failed")
+                continue
+            
+            list_path = f"{article_path}.concat.txt"
+            # Merge into a .part file so an interrupted merge never looks like finished audio
+            part_file = article_path + ".part"
             try:
-                print(f"\nProcessing {i}/{len(text_files)}: {text_file.name}")
+                with open(list_path, 'w', encoding='utf-8') as f:
+                    for path in part_paths:
+                        escaped = os.path.abspath(path).replace("'", "'\\''")
+                        f.write(f"file '{escaped}'\n")
                 
-                # Read article content
-                with open(text_file, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
+                self._prepare_part_file(article_path)
+                result = subprocess.run(
+                    [ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+                     "-i", list_path, "-c", "copy", "-f", "mp3", part_file],
+                    capture_output=True, text=True
+                )
                 
-                if not content:
-                    print(f"✗ Empty file: {text_file.name}")
-                    failed += 1
+                if result.returncode != 0:
+                    print(f"✗ Could not merge {article_path}: {result.stderr.strip()}")
                     continue
                 
-                # Split content if it's too long
-                if len(content) > max_length:
-                    print(f"⚠ Article too long ({len(content)} chars), splitting...")
-                    parts = self.split_text(content, max_length)
-                    
-                    for part_idx, part in enumerate(parts):
-                        audio_filename = f"{text_file.stem}_part{part_idx + 1:02d}.mp3"
-                        audio_path = os.path.join(output_folder, audio_filename)
-                        
-                        success = self.text_to_speech(part, voice_id, audio_path)
-                        if success:
-                            successful += 1
-                        else:
+                os.replace(part_file, article_path)
+                for path in part_paths:
+                    os.unlink(path)
+                print(f"✓ Merged {len(part_paths)} parts: {article_path}")
+                
+            except OSError as e:
+                print(f"✗ Could not merge {article_path}: {e}")
+            finally:
+                _discard_file(part_file)
+                _discard_file(list_path)
+    
+    def _print_summary(self, successful: int, failed: int, output_folder: str) -> None:
+        print(f"\n{'='*50}")
+        print(f"TTS Generation Complete!")
+        print(f"✓ Successful: {successful}")
+        print(f"✗ Failed: {failed}")
+        print(f"Audio files saved in: {output_folder}")
+    
+    def process_news_articles(self, articles_folder: str = "articles_for_tts", 
+                            output_folder: str = "audio_news", 
+                            voice_id: str = None,
+                            max_length: int = 5000,
+                            max_workers: int = 4,
+                            requests_per_second: float = 2.0,
+                            merge_parts: bool = True) -> None:
+        """
+        Process all news articles from the scraper and generate TTS
+        
+        Args:
+            articles_folder: Folder containing text articles
+            output_folder: Folder to save audio files
+            voice_id: Voice ID to use
+            max_length: Maximum text length per audio file (to avoid API limits)
+            max_workers: Number of concurrent TTS requests
+            requests_per_second: Maximum rate at which requests are started
+            merge_parts: Concatenate split articles into one file with ffmpeg
+        """
+        entries = self._list_articles(articles_folder, output_folder)
+        if entries is None:
+            return
+        
+        print(f"Generating audio with {max_workers} workers...")
+        
+        # Rate limiting - be respectful to the API
+        rate_limiter = RateLimiter(requests_per_second, burst=max_workers)
+        
+        # A producer reads and splits articles while workers post jobs, so
+        # file I/O and splitting overlap with network waits
+        jobs_queue = queue.Queue(maxsize=64)
+        split_articles = {}
+        generated = set()
+        failed = 0
+        lock = threading.Lock()
+        
+        def produce() -> None:
+            nonlocal failed
+            try:
+                for entry in entries:
+                    article = self._read_article_jobs(entry, output_folder, max_length)
+                    if article is None:
+                        with lock:
                             failed += 1
-                        
-                        # Rate limiting - be respectful to the API
-                        time.sleep(2)
-                else:
-                    # Generate single audio file
-                    audio_filename = f"{text_file.stem}.mp3"
-                    audio_path = os.path.join(output_folder, audio_filename)
+                        continue
                     
-                    success = self.text_to_speech(content, voice_id, audio_path)
+                    article_jobs, article_path = article
+                    if not article_jobs:
+                        with lock:
+                            generated.add(article_path)
+                    elif article_path:
+                        split_articles[article_path] = [audio_path for _, audio_path in article_jobs]
+                    for job in article_jobs:
+                        jobs_queue.put(job)
+            finally:
+                # One sentinel per worker signals the end of input
+                for _ in range(max_workers):
+                    jobs_queue.put(None)
+        
+        def consume() -> None:
+            nonlocal failed
+            while True:
+                job = jobs_queue.get()
+                if job is None:
+                    break
+                
+                text, audio_path = job
+                try:
+                    if _output_exists(audio_path):
+                        print(f"✓ Already generated: {audio_path}")
+                        success = True
+                    else:
+                        rate_limiter.wait()
+                        success = self.text_to_speech(text, voice_id, audio_path)
+                except Exception as e:
+                    print(f"✗ Error generating {audio_path}: {e}")
+                    success = False
+                
+                with lock:
                     if success:
-                        successful += 1
+                        generated.add(audio_path)
                     else:
                         failed += 1
+        
+        with ThreadPoolExecutor(max_workers=max_workers + 1) as executor:
+            workers = [executor.submit(produce)]
+            workers += [executor.submit(consume) for _ in range(max_workers)]
+            for worker in workers:
+                worker.result()
+        
+        if merge_parts:
+            self._merge_article_parts(split_articles, generated)
+        
+        self._print_summary(len(generated), failed, output_folder)
+    
+    async def process_news_articles_async(self, articles_folder: str = "articles_for_tts",
+                                          output_folder: str = "audio_news",
+                                          voice_id: str = None,
+                                          max_length: int = 5000,
+                                          max_concurrency: int = 8,
+                                          requests_per_second: float = 2.0,
+                                          merge_parts: bool = True) -> None:
+        """
+        Async variant of process_news_articles built on aiohttp
+        
+        All requests share one event loop and one connection pool instead
+        of one thread per in-flight request.
+        
+        Args:
+            articles_folder: Folder containing text articles
+            output_folder: Folder to save audio files
+            voice_id: Voice ID to use
+            max_length: Maximum text length per audio file (to avoid API limits)
+            max_concurrency: Maximum number of in-flight TTS requests
+            requests_per_second: Maximum rate at which requests are started
+            merge_parts: Concatenate split articles into one file with ffmpeg
+        """
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is required for async processing (pip install aiohttp)")
+        
+        entries = self._list_articles(articles_folder, output_folder)
+        if entries is None:
+            return
+        
+        print(f"Generating audio with up to {max_concurrency} concurrent requests...")
+        
+        rate_limiter = RateLimiter(requests_per_second, burst=max_concurrency)
+        
+        # Same producer/consumer layout as process_news_articles: synthesis
+        # starts on the first article while later ones are still being read
+        jobs_queue = asyncio.Queue(maxsize=64)
+        split_articles = {}
+        generated = set()
+        failed = 0
+        
+        async def produce() -> None:
+            nonlocal failed
+            loop = asyncio.get_running_loop()
+            try:
+                for entry in entries:
+                    # Reading and splitting is blocking file I/O, keep it off the event loop
+                    article = await loop.run_in_executor(
+                        None, self._read_article_jobs, entry, output_folder, max_length
+                    )
+                    if article is None:
+                        failed += 1
+                        continue
                     
-                    # Rate limiting
-                    time.sleep(2)
-                    
-            except Exception as e:
-                print(f"✗ Error processing {text_file.name}: {e}")
-                failed += 1
-                continue
+                    article_jobs, article_path = article
+                    if not article_jobs:
+                        generated.add(article_path)
+                    elif article_path:
+                        split_articles[article_path] = [audio_path for _, audio_path in article_jobs]
+                    for job in article_jobs:
+                        await jobs_queue.put(job)
+            finally:
+                # One sentinel per worker signals the end of input
+                for _ in range(max_concurrency):
+                    await jobs_queue.put(None)
         
-        print(f"\n{'='*50}")
-        print(f"TTS Generation Complete!")
-        print(f"✓ Successful: {successful}")
-        print(f"✗ Failed: {failed}")
-        print(f"Audio files saved in: {output_folder}")
+        async def consume(client: "aiohttp.ClientSession") -> None:
+            nonlocal failed
+            while True:
+                job = await jobs_queue.get()
+                if job is None:
+                    break
+                
+                text, audio_path = job
+                try:
+                    if _output_exists(audio_path):
+                        print(f"✓ Already generated: {audio_path}")
+                        success = True
+                    else:
+                        await rate_limiter.wait_async()
+                        success = await self.text_to_speech_async(client, text, voice_id, audio_path)
+                except Exception as e:
+                    print(f"✗ Error generating {audio_path}: {e}")
+                    success = False
+                
+                if success:
+                    generated.add(audio_path)
+                else:
+                    failed += 1
+        
+        connect_timeout, read_timeout = self.timeout
+        timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        connector = aiohttp.TCPConnector(limit=16, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector, headers=self.headers,
+                                         timeout=timeout) as client:
+            await asyncio.gather(produce(), *(consume(client) for _ in range(max_concurrency)))
+        
+        if merge_parts:
+            self._merge_article_parts(split_articles, generated)
+        
+        self._print_summary(len(generated), failed, output_folder)
+    
+    # Swedish sentence endings
+    _SENT_SPLIT = re.compile(r'[.!?]+\s+')
+    
+    def _iter_sentences(self, text: str) -> Iterator[str]:
+        """Lazily yield the pieces re.split(_SENT_SPLIT, text) would return"""
+        start = 0
+        for match in self._SENT_SPLIT.finditer(text):
+            yield text[start:match.start()]
+            start = match.end()
+        yield text[start:]
     
     def split_text(self, text: str, max_length: int) -> List[str]:
         """
@@ -213,27 +967,30 @@ class ElevenLabsSwedishTTS:
         Returns:
             List of text chunks
         """
-        # Split by sentences (Swedish sentence endings)
-        sentences = re.split(r'[.!?]+\s+', text)
-        
         chunks = []
-        current_chunk = ""
+        # Collect sentences and join once per chunk (avoids quadratic +=)
+        current_parts: List[str] = []
+        current_len = 0
         
-        for sentence in sentences:
+        for sentence in self._iter_sentences(text):
             sentence = sentence.strip()
             if not sentence:
                 continue
             
             # If adding this sentence would exceed max_length, start new chunk
-            if len(current_chunk) + len(sentence) + 2 > max_length and current_chunk:
-                chunks.append(current_chunk.strip())
-                current_chunk = sentence
+            if current_len + len(sentence) + 2 > max_length and current_parts:
+                chunks.append(". ".join(current_parts))
+                current_parts = [sentence]
+                current_len = len(sentence)
             else:
-                current_chunk += ". " + sentence if current_chunk else sentence
+                if current_parts:
+                    current_len += 2
+                current_parts.append(sentence)
+                current_len += len(sentence)
         
         # Add remaining chunk
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
+        if current_parts:
+            chunks.append(". ".join(current_parts))
         
         return chunks
     
@@ -277,46 +1034,48 @@ def main():
         return
     
     # Initialize TTS client
-    tts = ElevenLabsSwedishTTS(api_key)
-    
-    print("ElevenLabs Swedish TTS Generator")
-    print("=" * 40)
-    
-    # Get available voices
-    print("Fetching available voices...")
-    voices = tts.get_available_voices()
-    
-    if voices:
-        print("\nAvailable Swedish/Multilingual voices:")
-        for i, voice in enumerate(voices[:5]):  # Show first 5
-            print(f"{i+1}. {voice['name']} (ID: {voice['voice_id']})")
+    with ElevenLabsSwedishTTS(api_key) as tts:
+        print("ElevenLabs Swedish TTS Generator")
+        print("=" * 40)
         
-        # Let user choose voice
-        try:
-            choice = input(f"\nChoose voice (1-{len(voices)}) or press Enter for default: ").strip()
-            if choice and choice.isdigit():
-                choice_idx = int(choice) - 1
-                if 0 <= choice_idx < len(voices):
-                    selected_voice = voices[choice_idx]['voice_id']
+        # Get available voices
+        print("Fetching available voices...")
+        voices = tts.voices
+        
+        if voices:
+            print("\nAvailable Swedish/Multilingual voices:")
+            for i, voice in enumerate(voices[:5]):  # Show first 5
+                print(f"{i+1}. {voice['name']} (ID: {voice['voice_id']})")
+            
+            # Let user choose voice
+            try:
+                choice = input(f"\nChoose voice (1-{len(voices)}) or press Enter for default: ").strip()
+                if choice and choice.isdigit():
+                    choice_idx = int(choice) - 1
+                    if 0 <= choice_idx < len(voices):
+                        selected_voice = voices[choice_idx]['voice_id']
+                    else:
+                        selected_voice = None
                 else:
                     selected_voice = None
-            else:
+            except:
                 selected_voice = None
-        except:
+        else:
+            print("Could not fetch voices. Using default...")
             selected_voice = None
-    else:
-        print("Could not fetch voices. Using default...")
-        selected_voice = None
-    
-    # Process articles
-    print(f"\nProcessing news articles...")
-    tts.process_news_articles(voice_id=selected_voice)
-    
-    # Create playlist
-    print(f"\nCreating playlist...")
-    tts.create_playlist()
-    
-    print(f"\n✓ All done! Check the 'audio_news' folder for your Swedish news audio files.")
+        
+        # Process articles
+        print(f"\nProcessing news articles...")
+        if aiohttp is not None:
+            asyncio.run(tts.process_news_articles_async(voice_id=selected_voice))
+        else:
+            tts.process_news_articles(voice_id=selected_voice)
+        
+        # Create playlist
+        print(f"\nCreating playlist...")
+        tts.create_playlist()
+        
+        print(f"\n✓ All done! Check the 'audio_news' folder for your Swedish news audio files.")
 
 
 if __name__ == "__main__":
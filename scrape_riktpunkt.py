@@ -1,101 +1,262 @@
-import requests
-from bs4 import BeautifulSoup
+import argparse
+import asyncio
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+import orjson
+from selectolax.lexbor import LexborHTMLParser
 import re
 from datetime import datetime
-import json
-import time
 
-def scrape_news():
+# HTTP behaviour shared by all scraper requests
+REQUEST_CONFIG = {
+    "timeout": 10,
+    "retries": 3,
+    "backoff_factor": 0.3,
+    "retry_statuses": (502, 503, 504),
+    "max_connections": 16,
+    "headers": {
+        "User-Agent": "Mozilla/5.0 (compatible; newsTTS/1.0; +https://riktpunkt.nu/)",
+        "Accept-Encoding": "gzip, deflate",
+    },
+}
+
+# Pages are streamed in chunks and abandoned if they grow past this size
+READ_CHUNK_SIZE = 64 * 1024
+MAX_PAGE_BYTES = 5 * 1024 * 1024
+
+# Threads used to parse article pages off the event loop
+PARSE_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
+# Patterns used while extracting articles, compiled once at import
+_ARTICLE_DATE_RE = re.compile(r'/(\d{4})/(\d{2})/')
+_SITE_SUFFIX_RE = re.compile(r'\s*[-–|]\s*RiktpunKt.*$')
+_CATEGORY_RE = re.compile(r'\b(UTRIKES|INRIKES|FACKLIGT|EKONOMI|KULTUR)\b')
+_WS_RE = re.compile(r'\s+')
+_PARA_RE = re.compile(r'\n\s*\n')
+_FILENAME_BAD_RE = re.compile(r'[<>:"/\\|?*]')
+
+# CSS selectors used while extracting articles
+_LINK_SELECTOR = "a[href]"
+_CONTENT_SELECTOR = 'div[class*="content"], div[class*="article"], div[class*="post"]'
+# Tried in order, narrowest first; kept separate because lexbor returns a node
+# once per matching selector of a comma-joined group
+_PARAGRAPH_SELECTORS = ("article p", "main p", "p")
+# Elements whose contents are never read aloud; lexbor's text() would include them
+_NON_TEXT_TAGS = ["script", "style", "noscript", "template"]
+# Paragraphs inside these are page chrome, not article text
+_CHROME_TAGS = frozenset(["nav", "header", "footer", "aside", "script", "style"])
+
+# Extracted articles are cached per URL and revalidated with ETag/Last-Modified
+CACHE_DIR = ".scrape_cache"
+CACHE_TTL = 24 * 60 * 60
+
+def scrape_news(force_rescrape=False):
     """Scrape news articles with both headlines and full content from riktpunkt.nu"""
+    return asyncio.run(scrape_news_async(force_rescrape=force_rescrape))
+
+async def scrape_news_async(base_url="https://riktpunkt.nu/", max_articles=10, max_concurrency=8,
+                            force_rescrape=False):
+    """Fetch the front page, then fetch and parse articles concurrently"""
     
-    base_url = "https://riktpunkt.nu/"
-    
-    try:
-        # Get the main page
-        print("Fetching main page...")
-        response = requests.get(base_url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, "html.parser")
+    async with create_client() as client:
+        try:
+            # Get the main page
+            print("Fetching main page...")
+            response, body = await get_with_retries(client, base_url)
+            response.raise_for_status()
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"Error fetching main page: {e}")
+            return []
         
-        news_articles = []
+        tree = LexborHTMLParser(decode_html(response, body))
         
         # Find all article links on the main page
-        article_links = soup.find_all("a", href=True)
-        article_urls = []
+        article_links = tree.css(_LINK_SELECTOR)
+        article_urls = {}  # Insertion-ordered set of unique URLs
         
         for link in article_links:
-            href = link.get("href")
+            href = link.attributes.get("href")
             # Check if it's a full article URL (contains year/month pattern)
-            if href and re.search(r'/\d{4}/\d{2}/', href):
+            if href and _ARTICLE_DATE_RE.search(href):
                 if href.startswith('/'):
                     href = base_url.rstrip('/') + href
-                if href not in article_urls:
-                    article_urls.append(href)
+                article_urls[href] = None
         
         print(f"Found {len(article_urls)} article URLs")
         
-        # Scrape each article
-        for i, url in enumerate(article_urls[:10]):  # Limit to first 10 articles to avoid overloading
-            try:
-                print(f"Scraping article {i+1}/{min(10, len(article_urls))}: {url}")
-                
-                # Add delay to be respectful to the server
-                time.sleep(1)
-                
-                article_response = requests.get(url)
-                article_response.raise_for_status()
-                article_soup = BeautifulSoup(article_response.content, "html.parser")
-                
-                # Extract article data
-                article_data = extract_article_content(article_soup, url)
-                if article_data:
-                    news_articles.append(article_data)
-                    
-            except requests.RequestException as e:
-                print(f"Error fetching article {url}: {e}")
-                continue
-            except Exception as e:
-                print(f"Error processing article {url}: {e}")
-                continue
-        
-        # Save results
-        save_results(news_articles)
-        
-        print(f"Successfully scraped {len(news_articles)} articles")
-        return news_articles
+        # Scrape articles concurrently; the semaphore bounds load on the server
+        urls = list(article_urls)[:max_articles]  # Limit articles to avoid overloading
+        semaphore = asyncio.Semaphore(max_concurrency)
+        scraped_at = datetime.now().isoformat()  # One timestamp for the whole run
+        with ThreadPoolExecutor(max_workers=PARSE_WORKERS) as parse_executor:
+            results = await asyncio.gather(*(
+                fetch_article(client, semaphore, url, i, len(urls), force_rescrape, scraped_at,
+                              parse_executor)
+                for i, url in enumerate(urls, 1)
+            ))
+    
+    news_articles = [article for article in results if article]
+    
+    # Save results
+    save_results(news_articles)
+    
+    print(f"Successfully scraped {len(news_articles)} articles")
+    return news_articles
+
+def create_client():
+    """Create a pooled keep-alive HTTP/2 client for riktpunkt.nu"""
+    limits = httpx.Limits(max_connections=REQUEST_CONFIG["max_connections"])
+    # Transport retries cover connection failures; status retries are in get_with_retries
+    transport = httpx.AsyncHTTPTransport(http2=True, limits=limits,
+                                         retries=REQUEST_CONFIG["retries"])
+    return httpx.AsyncClient(transport=transport, headers=REQUEST_CONFIG["headers"],
+                             timeout=REQUEST_CONFIG["timeout"], follow_redirects=True)
+
+async def get_with_retries(client, url, **kwargs):
+    """GET url and return (response, body), retrying transient gateway errors with exponential backoff"""
+    for attempt in range(REQUEST_CONFIG["retries"] + 1):
+        async with client.stream("GET", url, **kwargs) as response:
+            if (response.status_code not in REQUEST_CONFIG["retry_statuses"]
+                    or attempt == REQUEST_CONFIG["retries"]):
+                return response, await read_body(response)
+        await asyncio.sleep(REQUEST_CONFIG["backoff_factor"] * (2 ** attempt))
+
+async def read_body(response):
+    """Read a streamed response body in chunks, refusing pages over MAX_PAGE_BYTES"""
+    chunks = []
+    size = 0
+    async for chunk in response.aiter_bytes(READ_CHUNK_SIZE):
+        size += len(chunk)
+        if size > MAX_PAGE_BYTES:
+            raise ValueError(f"Page larger than {MAX_PAGE_BYTES} bytes: {response.url}")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+async def fetch_article(client, semaphore, url, index, total, force_rescrape=False, scraped_at=None,
+                        parse_executor=None):
+    """Fetch and parse a single article, returning None on failure"""
+    
+    cached = None if force_rescrape else load_cached_article(url)
+    if cached and time.time() - cached["cached_at"] < CACHE_TTL:
+        print(f"Using cached article {index}/{total}: {url}")
+        return cached["article"]
+    
+    async with semaphore:
+        try:
+            print(f"Scraping article {index}/{total}: {url}")
+            
+            # Ask the server to skip the body if the page hasn't changed
+            headers = {}
+            if cached and cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached and cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+            
+            article_response, body = await get_with_retries(client, url, headers=headers)
+            if article_response.status_code == 304 and cached:
+                save_cached_article(url, cached["article"], article_response.headers)
+                return cached["article"]
+            
+            article_response.raise_for_status()
+            
+            # Extract article data in a worker thread so parsing doesn't stall other fetches
+            html = decode_html(article_response, body)
+            loop = asyncio.get_running_loop()
+            article_data = await loop.run_in_executor(
+                parse_executor, extract_article_content, html, url, scraped_at
+            )
+            if article_data:
+                save_cached_article(url, article_data, article_response.headers)
+            return article_data
+            
+        except httpx.HTTPError as e:
+            print(f"Error fetching article {url}: {e}")
+        except Exception as e:
+            print(f"Error processing article {url}: {e}")
         
-    except requests.RequestException as e:
-        print(f"Error fetching main page: {e}")
-        return []
+        return None
 
-def extract_article_content(soup, url):
-    """Extract title, category, date, and content from an article page"""
+def decode_html(response, body):
+    """Decode a page as UTF-8 unless its Content-Type declares another charset
     
+    The charset comes straight from the response header; page content is never sniffed.
+    """
     try:
+        return body.decode(response.charset_encoding or "utf-8", errors="ignore")
+    except LookupError:  # Unknown charset name in the header
+        return body.decode("utf-8", errors="ignore")
+
+def article_cache_path(url):
+    """Location of the cached extraction for url"""
+    return os.path.join(CACHE_DIR, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+def load_cached_article(url):
+    """Return the cache entry for url, or None if there is none"""
+    try:
+        with open(article_cache_path(url), "rb") as f:
+            return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+def save_cached_article(url, article, response_headers):
+    """Cache an extracted article together with its validators
+    
+    Failing to write the cache only prints a warning; the article itself is unaffected.
+    """
+    entry = {
+        "cached_at": time.time(),
+        "etag": response_headers.get("ETag"),
+        "last_modified": response_headers.get("Last-Modified"),
+        "article": article
+    }
+    cache_path = article_cache_path(url)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write to a temporary file first so readers never see a half-written entry
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(entry))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: could not cache article {url}: {e}")
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+def extract_article_content(html, url, scraped_at=None):
+    """Extract title, category, date, and content from an article page's HTML
+    
+    scraped_at defaults to the current time; pass it in to share one timestamp across a run.
+    """
+    
+    try:
+        tree = LexborHTMLParser(html)
+        tree.strip_tags(_NON_TEXT_TAGS)
+        
         # Extract title (usually in h1 or title tag)
         title = ""
-        title_tag = soup.find("h1")
+        title_tag = tree.css_first("h1")
         if title_tag:
-            title = title_tag.get_text().strip()
+            title = title_tag.text().strip()
         else:
             # Fallback to page title
-            title_tag = soup.find("title")
+            title_tag = tree.css_first("title")
             if title_tag:
-                title = title_tag.get_text().strip()
+                title = title_tag.text().strip()
                 # Remove site name if present
-                title = re.sub(r'\s*[-–|]\s*RiktpunKt.*$', '', title)
+                title = _SITE_SUFFIX_RE.sub('', title)
         
         # Extract category (usually appears before the main content)
-        category = ""
-        category_patterns = ["UTRIKES", "INRIKES", "FACKLIGT", "EKONOMI", "KULTUR"]
-        page_text = soup.get_text()
-        for pattern in category_patterns:
-            if pattern in page_text:
-                category = pattern
-                break
+        # Scan the raw HTML instead of materialising the whole document text
+        category_match = _CATEGORY_RE.search(html)
+        category = category_match.group(1) if category_match else ""
         
         # Extract date from URL
-        date_match = re.search(r'/(\d{4})/(\d{2})/', url)
+        date_match = _ARTICLE_DATE_RE.search(url)
         date = ""
         if date_match:
             year, month = date_match.groups()
@@ -106,28 +267,25 @@ def extract_article_content(soup, url):
         
         # Try to find the main article content
         # Method 1: Look for div with article content
-        content_div = soup.find("div", class_=re.compile(r"content|article|post"))
+        content_div = tree.css_first(_CONTENT_SELECTOR)
         if content_div:
-            content = content_div.get_text().strip()
+            content = content_div.text().strip()
         else:
-            # Method 2: Look for the main text content
-            # Remove navigation, footer, header elements
-            for element in soup(["nav", "header", "footer", "aside", "script", "style"]):
-                element.decompose()
-            
-            # Get all paragraphs
-            paragraphs = soup.find_all("p")
+            # Method 2: Collect paragraphs from the article body, skipping
+            # navigation, header and footer elements without mutating the tree
             content_parts = []
-            for p in paragraphs:
-                text = p.get_text().strip()
-                if text and len(text) > 50:  # Filter out short paragraphs
-                    content_parts.append(text)
+            for selector in _PARAGRAPH_SELECTORS:
+                paragraphs = (p for p in tree.css(selector) if not in_page_chrome(p))
+                # Filter out short paragraphs
+                content_parts = [text for text in (p.text().strip() for p in paragraphs) if len(text) > 50]
+                if content_parts:
+                    break
             
             content = "\n\n".join(content_parts)
         
         # Clean up content
-        content = re.sub(r'\s+', ' ', content).strip()
-        content = re.sub(r'\n\s*\n', '\n\n', content)
+        content = _WS_RE.sub(' ', content).strip()
+        content = _PARA_RE.sub('\n\n', content)
         
         # Skip if no meaningful content found
         if not title or len(content) < 100:
@@ -140,19 +298,28 @@ def extract_article_content(soup, url):
             "url": url,
             "content": content,
             "word_count": len(content.split()),
-            "scraped_at": datetime.now().isoformat()
+            "scraped_at": scraped_at or datetime.now().isoformat()
         }
         
     except Exception as e:
         print(f"Error extracting content from {url}: {e}")
         return None
 
+def in_page_chrome(node):
+    """True if node sits inside navigation, header, footer, aside, script or style"""
+    parent = node.parent
+    while parent is not None:
+        if parent.tag in _CHROME_TAGS:
+            return True
+        parent = parent.parent
+    return False
+
 def save_results(articles):
     """Save articles in multiple formats"""
     
     # Save as JSON for structured data
-    with open("scraped_news.json", "w", encoding="utf-8") as f:
-        json.dump(articles, f, ensure_ascii=False, indent=2)
+    with open("scraped_news.json", "wb") as f:
+        f.write(orjson.dumps(articles, option=orjson.OPT_INDENT_2))
     
     # Save as text file for easy reading
     with open("scraped_news.txt", "w", encoding="utf-8") as f:
@@ -170,7 +337,6 @@ def save_results(articles):
             f.write("No articles found with the current scraping method.\n")
     
     # Save content only for TTS (separate files for each article)
-    import os
     os.makedirs("articles_for_tts", exist_ok=True)
     
     for i, article in enumerate(articles, 1):
@@ -181,11 +347,16 @@ def save_results(articles):
 
 def sanitize_filename(filename):
     """Remove invalid characters from filename"""
-    return re.sub(r'[<>:"/\\|?*]', '_', filename)
+    return _FILENAME_BAD_RE.sub('_', filename)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape news articles from riktpunkt.nu")
+    parser.add_argument("--force-rescrape", action="store_true",
+                        help="ignore cached articles and download every page again")
+    args = parser.parse_args()
+    
     print("Starting news scraping from riktpunkt.nu...")
-    articles = scrape_news()
+    articles = scrape_news(force_rescrape=args.force_rescrape)
     
     if articles:
         print(f"\nScraping completed successfully!")